@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+
+"""
+BookSim2 Sweep Configuration Layer
+Validates, normalizes and deduplicates simulation configs before launch
+"""
+
+import os
+import re
+import sys
+import argparse
+import itertools
+from collections import Counter
+from functools import lru_cache
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+
+# Topologies accepted by Network::New (src/networks/network.cpp)
+TOPOLOGIES = ('torus', 'mesh', 'torus_credit', 'cmesh', 'fly', 'qtree', 'tree4',
+              'fattree', 'flatfly', 'anynet', 'dragonflynew')
+
+# Patterns accepted by TrafficPattern::New (src/traffic.cpp)
+TRAFFIC_PATTERNS = ('uniform', 'bitcomp', 'transpose', 'bitrev', 'shuffle', 'randperm',
+                    'background', 'diagonal', 'asymmetric', 'taper64', 'bad_dragon',
+                    'tornado', 'neighbor', 'badperm_yarc', 'hotspot')
+BIT_PERMUTATIONS = ('bitcomp', 'transpose', 'bitrev', 'shuffle')
+
+INJECTION_PROCESSES = ('bernoulli', 'on_off')
+
+# Minimum VCs per traffic class needed by routing functions that split their
+# VC range (see the available_vcs / vcs_per_dest asserts in src/routefunc.cpp)
+MIN_VCS = {
+    'dim_order_torus': lambda nodes, k: 2,
+    'dim_order_bal_torus': lambda nodes, k: 2,
+    'xy_yx_mesh': lambda nodes, k: 2,
+    'adaptive_xy_yx_mesh': lambda nodes, k: 2,
+    'romm_mesh': lambda nodes, k: 2,
+    'valiant_mesh': lambda nodes, k: 2,
+    'valiant_torus': lambda nodes, k: 4,
+    'planar_adapt_mesh': lambda nodes, k: 3,
+    'dim_order_ni_mesh': lambda nodes, k: nodes,
+    'romm_ni_mesh': lambda nodes, k: nodes,
+    'dim_order_ni_torus': lambda nodes, k: nodes,
+    'valiant_ni_torus': lambda nodes, k: 4 * nodes,
+    'dim_order_pni_mesh': lambda nodes, k: k,
+}
+
+
+class ConfigError(ValueError):
+    """Raised for parameters booksim would reject while parsing the config"""
+
+
+def strip_cpp_comments(source):
+    """Removes // and /* */ comments so commented-out registrations are ignored"""
+    return re.sub(r'//[^\n]*|/\*.*?\*/', '', source, flags=re.S)
+
+
+@lru_cache(maxsize=None)
+def load_schema(src_dir=SRC_DIR):
+    """
+    Reads the parameter schema from the BookSimConfig constructor.
+    Returns a dictionary mapping each field to a (kinds, default) pair, where
+    kinds is the set of value types booksim accepts for that field.
+    """
+    with open(os.path.join(src_dir, 'booksim_config.cpp'), 'r') as f:
+        source = strip_cpp_comments(f.read())
+
+    # Only the network config; PowerConfig has its own file format
+    source = source.split('PowerConfig::PowerConfig')[0]
+
+    schema = {}
+    for kind, name, default in re.findall(r'_(int|float)_map\["(\w+)"\]\s*=\s*([^;]+);', source):
+        value = int(default) if kind == 'int' else float(default)
+        schema[name] = ({kind}, value)
+    for name, default in re.findall(r'AddStrField\(\s*"(\w+)"\s*,\s*"([^"]*)"\s*\)', source):
+        if name in schema:
+            # Numeric field with a string "workaround" for vector/special values
+            schema[name][0].add('str')
+        else:
+            schema[name] = ({'str'}, default)
+
+    return {name: (frozenset(kinds), default) for name, (kinds, default) in schema.items()}
+
+
+@lru_cache(maxsize=None)
+def load_routing_functions(src_dir=SRC_DIR):
+    """Returns the names registered in gRoutingFunctionMap across the sources"""
+    names = set()
+    sources = [os.path.join(src_dir, 'routefunc.cpp')]
+    networks_dir = os.path.join(src_dir, 'networks')
+    sources += [os.path.join(networks_dir, f) for f in sorted(os.listdir(networks_dir))
+                if f.endswith('.cpp')]
+    for path in sources:
+        with open(path, 'r') as f:
+            names.update(re.findall(r'gRoutingFunctionMap\["(\w+)"\]\s*=',
+                                    strip_cpp_comments(f.read())))
+    return frozenset(names)
+
+
+def normalize_value(name, value, schema=None):
+    """
+    Converts value to the type booksim's parser expects for the field.
+    Integer-valued floats become ints for integer fields and ints become floats
+    for float fields, since booksim rejects a literal of the wrong kind.
+    """
+    schema = schema or load_schema()
+    if name not in schema:
+        raise ConfigError(f"Unknown field: {name}")
+    kinds, _ = schema[name]
+
+    if isinstance(value, str):
+        text = value.strip().strip('"')
+        for kind, parse in (('int', int), ('float', float)):
+            if kind in kinds:
+                try:
+                    value = parse(text)
+                    break
+                except ValueError:
+                    pass
+        else:
+            if 'str' in kinds:
+                return text
+            if 'int' in kinds:
+                try:
+                    value = float(text)
+                except ValueError:
+                    raise ConfigError(f"{name} expects a number, got '{text}'")
+            else:
+                raise ConfigError(f"{name} expects a number, got '{text}'")
+
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, float) and 'int' in kinds and 'float' not in kinds:
+        if not value.is_integer():
+            raise ConfigError(f"{name} expects an integer, got {value}")
+        return int(value)
+    if isinstance(value, int) and 'int' not in kinds:
+        if 'float' in kinds:
+            return float(value)
+        return str(value)
+    if isinstance(value, (int, float)):
+        return value
+    raise ConfigError(f"Unsupported value for {name}: {value!r}")
+
+
+def format_value(value):
+    """Formats a normalized value as a booksim config literal"""
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def parse_config_file(path):
+    """Parses a booksim config file into an ordered dictionary of raw values"""
+    with open(path, 'r') as f:
+        text = re.sub(r'//[^\n]*', '', f.read())
+    params = {}
+    for statement in text.split(';'):
+        if not statement.strip():
+            continue
+        if '=' not in statement:
+            raise ConfigError(f"{path}: malformed statement '{statement.strip()}'")
+        name, value = statement.split('=', 1)
+        params[name.strip()] = value.strip()
+    return params
+
+
+def split_pattern(pattern):
+    """Splits 'name(p1,p2)' into the name and its parameter list, like TrafficPattern::New"""
+    left = pattern.find('(')
+    if left < 0:
+        return pattern, []
+    right = pattern.rfind(')')
+    param_str = pattern[left + 1:] if right < 0 else pattern[left + 1:right]
+    params = [p for p in param_str.split(',') if p] if param_str else []
+    return pattern[:left], params
+
+
+def split_vector(value):
+    """Splits a '{a,b(c,d)}' per-class vector into its top-level elements"""
+    if not (isinstance(value, str) and value.startswith('{') and value.endswith('}')):
+        return [value]
+    items, depth, current = [], 0, ''
+    for ch in value[1:-1]:
+        if ch in '({':
+            depth += 1
+        elif ch in ')}':
+            depth -= 1
+        if ch == ',' and depth == 0:
+            items.append(current)
+            current = ''
+        else:
+            current += ch
+    items.append(current)
+    return items
+
+
+class SimConfig:
+    """
+    A normalized booksim configuration.
+    Only explicitly set parameters are written out, but equality and hashing
+    consider the effective value of every field, so configs that differ only
+    in spelling or in restating a default compare equal.
+    """
+
+    def __init__(self, params=None, **overrides):
+        self.schema = load_schema()
+        self.params = {}
+        for name, value in dict(params or {}, **overrides).items():
+            self.params[name] = normalize_value(name, value, self.schema)
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(parse_config_file(path))
+
+    def replace(self, **overrides):
+        """Returns a copy with the given parameters changed"""
+        return SimConfig(self.params, **overrides)
+
+    def get(self, name):
+        """Returns the effective value of name, falling back to booksim's default"""
+        if name in self.params:
+            return self.params[name]
+        return self.schema[name][1]
+
+    def key(self):
+        """Canonical identity of the simulation this config describes"""
+        effective = {name: default for name, (_, default) in self.schema.items()}
+        effective.update(self.params)
+        return tuple(sorted(effective.items()))
+
+    def __eq__(self, other):
+        return isinstance(other, SimConfig) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"SimConfig({self.params!r})"
+
+    def nodes(self):
+        """Number of terminal nodes, or None when it cannot be derived statically"""
+        topology = self.get('topology')
+        k, n = self.get('k'), self.get('n')
+        if topology in ('torus', 'mesh', 'torus_credit', 'fly'):
+            return k ** n
+        if topology == 'cmesh':
+            return k ** n * self.get('c')
+        return None
+
+    def to_text(self):
+        """Renders the config in booksim's 'name = value;' format"""
+        return ''.join(f"{name} = {format_value(value)};\n" for name, value in self.params.items())
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            f.write(self.to_text())
+
+
+def infeasibility(config):
+    """
+    Statically checks a config against conditions that make booksim exit,
+    assert or deadlock. Returns a list of (category, message) pairs; an empty
+    list means the config is worth launching.
+    """
+    problems = []
+    get = config.get
+
+    for name in ('k', 'n', 'num_vcs', 'vc_buf_size', 'sample_period', 'max_samples', 'sim_count'):
+        if get(name) < 1:
+            problems.append(('value', f"{name} must be at least 1, got {get(name)}"))
+    if get('warmup_periods') < 0:
+        problems.append(('value', f"warmup_periods must be non-negative, got {get('warmup_periods')}"))
+    if problems:
+        return problems
+
+    topology = get('topology')
+    if topology not in TOPOLOGIES:
+        problems.append(('topology', f"Unknown topology: {topology}"))
+        return problems
+
+    nodes = config.nodes()
+    k = get('k')
+
+    if topology == 'torus_credit' and get('num_vcs') < 2:
+        problems.append(('deadlock', "torus_credit deadlocks without a second (dateline) VC"))
+
+    # Routing function lookup is '<routing_function>_<topology>'
+    routing = f"{get('routing_function')}_{topology}"
+    if routing not in load_routing_functions():
+        problems.append(('routing', f"Invalid routing function: {routing}"))
+    else:
+        base = routing[:-len('_torus_credit')] if topology == 'torus_credit' else routing
+        if base in MIN_VCS and nodes is not None:
+            # Request and reply classes each get half the VCs with read/write
+            # traffic; use_read_write may be a per-class vector like '{1,0}'
+            try:
+                read_write = any(int(str(flag).strip()) for flag in split_vector(get('use_read_write')))
+            except ValueError:
+                read_write = False
+                problems.append(('value', f"use_read_write must be 0/1 per class, "
+                                          f"got {get('use_read_write')}"))
+            available = get('num_vcs') // 2 if read_write else get('num_vcs')
+            required = MIN_VCS[base](nodes, k)
+            if available < required:
+                problems.append(('vcs', f"{routing} needs {required} VCs per class, "
+                                        f"only {available} available"))
+
+    for pattern in split_vector(get('traffic')):
+        name, params = split_pattern(pattern)
+        if name not in TRAFFIC_PATTERNS:
+            problems.append(('traffic', f"Unknown traffic pattern: {pattern}"))
+        elif name == 'background' and not params:
+            problems.append(('traffic', "background traffic requires a list of excluded nodes"))
+        elif nodes is not None and name in BIT_PERMUTATIONS and nodes & (nodes - 1):
+            problems.append(('traffic', f"{name} requires a power-of-two node count, got {nodes}"))
+        elif nodes is not None and name == 'transpose' and (nodes.bit_length() - 1) % 2:
+            problems.append(('traffic', f"transpose requires an even power-of-two node count, got {nodes}"))
+        elif nodes is not None and name == 'taper64' and nodes != 64:
+            problems.append(('traffic', f"taper64 requires exactly 64 nodes, got {nodes}"))
+
+    process, _ = split_pattern(get('injection_process'))
+    if process not in INJECTION_PROCESSES:
+        problems.append(('injection', f"Invalid injection process: {process}"))
+    rate = get('injection_rate')
+    if isinstance(rate, float):
+        # Flit rates are converted to packet rates before reaching the process
+        packet_size = get('packet_size')
+        if get('injection_rate_uses_flits') and isinstance(packet_size, int):
+            rate /= packet_size
+        if not 0.0 <= rate <= 1.0:
+            problems.append(('injection', f"Injection process load must be in [0, 1], got {rate}"))
+
+    return problems
+
+
+class SweepReport:
+    """Counts what a sweep generated, dropped and kept"""
+
+    def __init__(self):
+        self.generated = 0
+        self.duplicates = 0
+        self.infeasible = Counter()
+        self.kept = 0
+
+    @property
+    def avoided(self):
+        return self.duplicates + sum(self.infeasible.values())
+
+    def summary(self):
+        lines = [f"Generated points: {self.generated}",
+                 f"Duplicates dropped: {self.duplicates}"]
+        for category, count in sorted(self.infeasible.items()):
+            lines.append(f"Infeasible ({category}): {count}")
+        lines.append(f"Simulations to run: {self.kept}")
+        lines.append(f"Simulations avoided: {self.avoided}")
+        return '\n'.join(lines)
+
+
+def expand_grid(base, axes):
+    """
+    Lazily yields one config per point of the cartesian product of axes.
+    axes maps parameter names to the values to sweep, in sweep order.
+    """
+    names = list(axes)
+    for values in itertools.product(*(axes[name] for name in names)):
+        yield base.replace(**dict(zip(names, values)))
+
+
+def prune(configs, report=None, verbose=False):
+    """
+    Filters a config stream down to unique, statically feasible configs.
+    Dropped points are counted in report, keyed by the first problem found.
+    """
+    report = report if report is not None else SweepReport()
+    seen = set()
+    for config in configs:
+        report.generated += 1
+        key = config.key()
+        if key in seen:
+            report.duplicates += 1
+            continue
+        seen.add(key)
+        problems = infeasibility(config)
+        if problems:
+            report.infeasible[problems[0][0]] += 1
+            if verbose:
+                print(f"Skipping {config.params}: {problems[0][1]}")
+            continue
+        report.kept += 1
+        yield config
+
+
+def parse_axis(spec):
+    """Parses a 'name=v1,v2,...' sweep axis from the command line"""
+    if '=' not in spec:
+        raise argparse.ArgumentTypeError(f"expected name=v1,v2,... got '{spec}'")
+    name, values = spec.split('=', 1)
+    return name.strip(), [v.strip() for v in split_vector('{' + values + '}')]
+
+
+def check_files(paths):
+    """Validates existing config files and reports duplicates among them"""
+    report = SweepReport()
+    groups = {}
+    for path in paths:
+        report.generated += 1
+        try:
+            config = SimConfig.from_file(path)
+        except ConfigError as e:
+            report.infeasible['parse'] += 1
+            print(f"{path}: {e}")
+            continue
+        groups.setdefault(config.key(), []).append(path)
+        if len(groups[config.key()]) > 1:
+            report.duplicates += 1
+            continue
+        problems = infeasibility(config)
+        for category, message in problems:
+            print(f"{path}: [{category}] {message}")
+        if problems:
+            report.infeasible[problems[0][0]] += 1
+        else:
+            report.kept += 1
+
+    for paths_with_key in groups.values():
+        if len(paths_with_key) > 1:
+            print(f"Identical configs: {', '.join(paths_with_key)}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate and expand booksim sweep configurations.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    check_parser = subparsers.add_parser('check', help='Validate existing config files')
+    check_parser.add_argument('files', nargs='+', help='Config files to check')
+
+    expand_parser = subparsers.add_parser('expand', help='Write the feasible, unique points of a sweep grid')
+    expand_parser.add_argument('--base', required=True, help='Config file holding the fixed parameters')
+    expand_parser.add_argument('--set', dest='axes', action='append', type=parse_axis, default=[],
+                               metavar='NAME=V1,V2', help='Parameter to sweep (repeatable)')
+    expand_parser.add_argument('--out-dir', default=os.path.join(PROJECT_ROOT, 'configs'),
+                               help='Directory for generated config files')
+    expand_parser.add_argument('--prefix', default='sweep', help='File name prefix for generated configs')
+    expand_parser.add_argument('--dry-run', action='store_true', help='Only report, do not write files')
+    expand_parser.add_argument('--verbose', action='store_true', help='Print why each point was skipped')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'check':
+            report = check_files(args.files)
+        else:
+            base = SimConfig.from_file(args.base)
+            axes = dict(args.axes)
+            report = SweepReport()
+            if not args.dry_run:
+                os.makedirs(args.out_dir, exist_ok=True)
+            for config in prune(expand_grid(base, axes), report, verbose=args.verbose):
+                name = '_'.join([args.prefix] + [format_value(config.get(axis)) for axis in axes])
+                path = os.path.join(args.out_dir, name + '.txt')
+                if args.dry_run:
+                    print(path)
+                else:
+                    config.write(path)
+    except ConfigError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+
+"""
+BookSim2 Sweep Dashboard
+Tails the sweep results CSV and keeps a static HTML report up to date while
+the sweep is running
+"""
+
+import os
+import io
+import csv
+import html
+import time
+import argparse
+from collections import Counter, deque
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from sweep_config import PROJECT_ROOT
+from sweep_runner import RESULTS_CSV
+
+DASHBOARD_DIR = os.path.join(PROJECT_ROOT, 'results', 'dashboard')
+
+# Curves are grouped by network and traffic, with one line per VC count
+GROUP_FIELDS = ('topology', 'k', 'n', 'traffic_pattern')
+
+RATE_WINDOW = 600  # seconds of finished runs used for the runs/minute estimate
+
+
+def _number(value):
+    """Parses a CSV cell as a float, returning None for N/A and friends"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ResultsTail:
+    """
+    Follows a growing CSV file and returns only the rows appended since the
+    last poll. A trailing partial line is held back until it is completed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.header = None
+        self.pending = ''
+
+    def poll(self):
+        if not os.path.exists(self.path):
+            return []
+        if os.path.getsize(self.path) < self.offset:
+            # Results file was recreated; start over
+            self.offset = 0
+            self.header = None
+            self.pending = ''
+        with open(self.path, 'r', newline='') as f:
+            f.seek(self.offset)
+            data = f.read()
+            self.offset = f.tell()
+
+        data = self.pending + data
+        complete, _, self.pending = data.rpartition('\n')
+        if not complete:
+            return []
+        rows = list(csv.reader(io.StringIO(complete + '\n')))
+        if self.header is None:
+            self.header, rows = rows[0], rows[1:]
+        return [dict(zip(self.header, row)) for row in rows if row]
+
+
+class SweepAggregates:
+    """
+    Running aggregates over the results seen so far.
+    Each row only updates the cell for its (group, num_vcs, injection_rate)
+    and marks its group dirty, so the cost of an update does not depend on
+    how many rows came before it.
+    """
+
+    def __init__(self, sweep_id=None, planned=0):
+        self.sweep_id = sweep_id
+        self.planned = planned
+        self.runs = 0
+        self.live = 0
+        self.statuses = Counter()
+        self.failed = 0
+        self.first_finished = None
+        self.recent = deque()
+        # group -> {(num_vcs, injection_rate): [count, latency_sum, throughput_sum]}
+        self.groups = {}
+        self.dirty = set()
+
+    def add(self, row, now=None):
+        """
+        Folds one result row in. Rows without a finished_at column are timed
+        by arrival (now); pass None for backlog rows whose time is unknown so
+        they do not distort the completion rate.
+        """
+        self.runs += 1
+        if now is not None:
+            self.live += 1
+        self.statuses[row.get('status') or 'N/A'] += 1
+
+        finished = _number(row.get('finished_at')) or now
+        if finished is not None:
+            if self.first_finished is None or finished < self.first_finished:
+                self.first_finished = finished
+            self.recent.append(finished)
+
+        latency = _number(row.get('avg_latency'))
+        rate = _number(row.get('injection_rate'))
+        if latency is None or rate is None:
+            self.failed += 1
+            return
+
+        group = tuple(row.get(field, 'N/A') for field in GROUP_FIELDS)
+        cells = self.groups.setdefault(group, {})
+        cell = cells.setdefault((row.get('num_vcs', 'N/A'), rate), [0, 0.0, 0.0])
+        cell[0] += 1
+        cell[1] += latency
+        cell[2] += _number(row.get('throughput')) or 0.0
+        self.dirty.add(group)
+
+    def runs_per_minute(self, now):
+        """Completion rate over the last RATE_WINDOW seconds"""
+        while self.recent and self.recent[0] < now - RATE_WINDOW:
+            self.recent.popleft()
+        if not self.recent:
+            return 0.0
+        span = min(RATE_WINDOW, now - self.first_finished)
+        return len(self.recent) * 60.0 / max(span, 1.0)
+
+    def eta(self, total, now):
+        """Seconds until total runs are finished at the current rate, or None"""
+        rate = self.runs_per_minute(now)
+        if not total or rate == 0:
+            return None
+        return max(total - self.runs, 0) * 60.0 / rate
+
+
+class SweepSet:
+    """
+    Aggregates for every sweep in a results file, keyed by sweep id.
+    Several runners may append to the same file, so rows of different sweeps
+    can interleave; each row only updates its own sweep.
+    """
+
+    def __init__(self):
+        self.sweeps = {}
+
+    def add(self, row, now=None):
+        sweep_id = row.get('sweep_id', '')
+        aggregates = self.sweeps.get(sweep_id)
+        if aggregates is None:
+            planned = int(_number(row.get('sweep_total')) or 0)
+            aggregates = self.sweeps[sweep_id] = SweepAggregates(sweep_id, planned)
+        aggregates.add(row, now)
+
+    def select(self, sweep_id=None):
+        """The sweep with the given id, or else the one that started last"""
+        if sweep_id is not None:
+            return self.sweeps.setdefault(sweep_id, SweepAggregates(sweep_id))
+        if not self.sweeps:
+            return SweepAggregates()
+        return next(reversed(self.sweeps.values()))
+
+
+def group_name(group):
+    return '_'.join(str(part) for part in group).replace('/', '_').replace(' ', '_')
+
+
+def _replace_atomically(path, write):
+    """Writes path via a temporary file so readers never see a partial file"""
+    tmp_path = path + '.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def render_group(group, cells, out_dir):
+    """Redraws the latency and throughput curves of one group"""
+    by_vcs = {}
+    for (vcs, rate), (count, latency_sum, throughput_sum) in cells.items():
+        by_vcs.setdefault(vcs, []).append((rate, latency_sum / count, throughput_sum / count))
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+    for vcs in sorted(by_vcs, key=lambda v: _number(v) or 0):
+        points = sorted(by_vcs[vcs])
+        rates = [p[0] for p in points]
+        ax1.plot(rates, [p[1] for p in points], marker='o', linewidth=2, label=f'VC={vcs}')
+        ax2.plot(rates, [p[2] for p in points], marker='s', linewidth=2, label=f'VC={vcs}')
+
+    ax1.set_xlabel('Injection Rate')
+    ax1.set_ylabel('Average Latency (cycles)')
+    ax1.set_title('Latency vs Injection Rate')
+    ax2.set_xlabel('Injection Rate')
+    ax2.set_ylabel('Throughput (packets/cycle/node)')
+    ax2.set_title('Throughput vs Injection Rate')
+    for ax in (ax1, ax2):
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+    topology, k, n, traffic = group
+    fig.suptitle(f'{topology} k={k} n={n}, {traffic} traffic')
+    fig.tight_layout()
+
+    path = os.path.join(out_dir, group_name(group) + '.png')
+    _replace_atomically(path, lambda tmp: fig.savefig(tmp, dpi=100, format='png'))
+    plt.close(fig)
+
+
+def _format_duration(seconds):
+    if seconds is None:
+        return 'N/A'
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h{rest // 60:02d}m{rest % 60:02d}s"
+
+
+def status_lines(aggregates, total, now):
+    """Summary of sweep progress, shared by the terminal and HTML output"""
+    progress = f"{aggregates.runs}/{total}" if total else str(aggregates.runs)
+    lines = [f"Finished runs: {progress}",
+             f"Runs/minute: {aggregates.runs_per_minute(now):.2f}",
+             f"ETA: {_format_duration(aggregates.eta(total, now))}"]
+    if aggregates.runs:
+        lines.append(f"Runs without results: {aggregates.failed} "
+                     f"({aggregates.failed / aggregates.runs * 100:.1f}%)")
+        for status, count in aggregates.statuses.most_common():
+            lines.append(f"  {status}: {count} ({count / aggregates.runs * 100:.1f}%)")
+    return lines
+
+
+def write_html(aggregates, total, out_dir, now, refresh):
+    """Rewrites the index page; plots are referenced, not re-embedded"""
+    version = int(now)
+    summary = '\n'.join(html.escape(line) for line in status_lines(aggregates, total, now))
+    images = '\n'.join(
+        f'<h3>{html.escape(" / ".join(str(p) for p in group))}</h3>\n'
+        f'<img src="{html.escape(group_name(group))}.png?v={version}">'
+        for group in sorted(aggregates.groups))
+    page = (f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            f'<meta http-equiv="refresh" content="{refresh}">\n'
+            f'<title>BookSim2 Sweep Dashboard</title>\n</head>\n<body>\n'
+            f'<h1>BookSim2 Sweep Dashboard</h1>\n'
+            f'<p>Sweep {html.escape(aggregates.sweep_id or "N/A")}, updated '
+            f'{time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))}</p>\n'
+            f'<pre>{summary}</pre>\n{images}\n</body>\n</html>\n')
+
+    def write(path):
+        with open(path, 'w') as f:
+            f.write(page)
+    _replace_atomically(os.path.join(out_dir, 'index.html'), write)
+
+
+def refresh(aggregates, total, out_dir, now, page_refresh):
+    """Redraws the groups that changed since the last refresh and the index page"""
+    for group in aggregates.dirty:
+        render_group(group, aggregates.groups[group], out_dir)
+    aggregates.dirty.clear()
+    write_html(aggregates, total, out_dir, now, page_refresh)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Live dashboard for a running booksim sweep.')
+    parser.add_argument('--results', default=RESULTS_CSV, help='Results CSV written by sweep_runner.py')
+    parser.add_argument('--out-dir', default=DASHBOARD_DIR, help='Directory for the HTML report and plots')
+    parser.add_argument('--total', type=int, default=0,
+                        help='Number of runs in the sweep, for the ETA (default: as recorded by the runner)')
+    parser.add_argument('--poll', type=float, default=2.0, help='Seconds between checks for new results')
+    parser.add_argument('--min-interval', type=float, default=30.0,
+                        help='Minimum seconds between report rewrites')
+    parser.add_argument('--sweep-id', default=None,
+                        help='Sweep to report on (default: the last one started in the results file)')
+    parser.add_argument('--once', action='store_true', help='Build the report once and exit')
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    tail = ResultsTail(args.results)
+    sweeps = SweepSet()
+    aggregates = sweeps.select(args.sweep_id)
+    last_write = None
+    page_refresh = max(int(args.min_interval), 1)
+
+    try:
+        while True:
+            now = time.time()
+            for row in tail.poll():
+                sweeps.add(row, now if last_write is not None else None)
+            selected = sweeps.select(args.sweep_id)
+            if selected is not aggregates:
+                # Plot files are shared between sweeps, so redraw them all
+                aggregates = selected
+                aggregates.dirty.update(aggregates.groups)
+            total = args.total or aggregates.planned
+
+            if last_write is None or now - last_write >= args.min_interval:
+                refresh(aggregates, total, args.out_dir, now, page_refresh)
+                last_write = now
+                if not args.once:
+                    print(' | '.join(status_lines(aggregates, total, now)[:3]), flush=True)
+
+            # A sweep that was already complete when the dashboard started is
+            # not a reason to stop; wait for rows of a running one
+            if args.once or (total and aggregates.live and aggregates.runs >= total):
+                break
+            time.sleep(args.poll)
+    except KeyboardInterrupt:
+        pass
+
+    # Flush anything that arrived after the last rate-limited rewrite
+    total = args.total or aggregates.planned
+    refresh(aggregates, total, args.out_dir, time.time(), page_refresh)
+    print('\n'.join(status_lines(aggregates, total, time.time())))
+    print(f"Report written to {os.path.join(args.out_dir, 'index.html')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+
+"""
+BookSim2 Sweep Runner
+Launches booksim for each sweep point and records the results, either with
+the warmup/sample lengths fixed in the config or chosen per point at runtime
+"""
+
+import os
+import re
+import csv
+import sys
+import time
+import signal
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import namedtuple
+from statistics import NormalDist
+
+from sweep_config import PROJECT_ROOT, ConfigError, SimConfig, SweepReport, prune
+
+BOOKSIM_EXE = os.path.join(PROJECT_ROOT, 'src', 'booksim')
+RESULTS_CSV = os.path.join(PROJECT_ROOT, 'results', 'sweep_results.csv')
+
+RESULT_FIELDS = ['topology', 'k', 'n', 'nodes', 'traffic_pattern', 'injection_rate', 'num_vcs',
+                 'avg_latency', 'avg_hops', 'throughput', 'energy_per_packet', 'simulation_time',
+                 'status', 'mode', 'sample_period', 'warmup_cycles', 'measured_cycles', 'samples',
+                 'config', 'finished_at', 'sweep_id', 'sweep_total']
+
+# One sample period of streamed statistics for traffic class 0.
+# latency is the mean packet latency of packets retired in that period and
+# packets is how many were retired; latency is None when packets is 0.
+Sample = namedtuple('Sample', ['index', 'latency', 'packets'])
+
+MSER_BATCH = 5
+
+# booksim warns after deadlock_warn_timeout cycles without a retired flit and
+# a busy period can trip it once; only this many warnings in a row, with no
+# packets retired in between, are treated as a deadlock
+DEADLOCK_WARNINGS = 3
+
+
+def iter_samples(lines, nodes, period, events=None):
+    """
+    Turns booksim's per-period DisplayStats output into per-period samples.
+
+    The adaptive config keeps booksim warming up for the whole run, so stats
+    are cleared before every even period and the odd periods report averages
+    over two periods; those are unwound here using the accepted packet rate
+    to recover each period's packet count. Every period is yielded, including
+    ones that retired no packets. Latency threshold aborts and repeated
+    deadlock warnings are appended to events when given.
+    """
+    index = 0
+    warnings = 0
+    cls = None
+    in_block = False
+    latency = rate = None
+    prev_packets = prev_total = 0.0
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith('Class '):
+            cls = line[len('Class '):].rstrip(':')
+            in_block = True
+        elif cls == '0' and line.startswith('Packet latency average = '):
+            latency = float(line.split('=')[1])
+        elif cls == '0' and line.startswith('Accepted packet rate average = '):
+            rate = float(line.split('=')[1])
+        elif line.startswith('latency change'):
+            # Printed once per measured class after the DisplayStats block;
+            # only the first one after a block closes the period
+            if not in_block:
+                continue
+            in_block = False
+            if index % 2 == 0:
+                prev_packets = prev_total = 0.0
+            window = period * (index % 2 + 1)
+            if rate is None or latency is None:
+                packets, total = 0, 0.0
+            else:
+                packets = round(rate * nodes * window)
+                total = latency * packets
+            if packets > prev_packets:
+                warnings = 0
+                yield Sample(index, (total - prev_total) / (packets - prev_packets),
+                             packets - prev_packets)
+            else:
+                yield Sample(index, None, 0)
+            prev_packets, prev_total = packets, total
+            latency = rate = None
+            cls = None
+            index += 1
+        elif events is not None:
+            if 'Aborting simulation' in line:
+                events.append('saturated')
+            elif 'Possible network deadlock' in line:
+                warnings += 1
+                if warnings == DEADLOCK_WARNINGS:
+                    events.append('deadlock')
+
+
+def mser5(observations):
+    """
+    MSER-5 truncation point for a series of observations.
+    Returns (d, batches) where batches are the means of consecutive groups of
+    five observations and the first d batches are the warmup transient.
+    """
+    count = len(observations) - len(observations) % MSER_BATCH
+    batches = [sum(observations[i:i + MSER_BATCH]) / MSER_BATCH
+               for i in range(0, count, MSER_BATCH)]
+    m = len(batches)
+    if m == 0:
+        return 0, batches
+
+    # Walk the truncation point backwards, keeping suffix sums so each
+    # candidate's statistic costs O(1)
+    best_d, best_stat = 0, float('inf')
+    total = total_sq = 0.0
+    for d in range(m - 1, -1, -1):
+        total += batches[d]
+        total_sq += batches[d] ** 2
+        if d > m // 2:
+            continue
+        kept = m - d
+        stat = (total_sq - total ** 2 / kept) / kept ** 2
+        if stat <= best_stat:
+            best_d, best_stat = d, stat
+    return best_d, batches
+
+
+def t_quantile(p, df):
+    """
+    Student-t quantile from the normal one via the Cornish-Fisher expansion;
+    within 0.002 of the exact value for df >= 5 at the usual confidence levels
+    """
+    z = NormalDist().inv_cdf(p)
+    return (z + (z ** 3 + z) / (4 * df)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3))
+
+
+def relative_half_width(values, num_batches, confidence):
+    """Batch-means confidence half-width relative to the mean"""
+    size = len(values) // num_batches
+    if size == 0:
+        return float('inf')
+    means = [sum(values[i * size:(i + 1) * size]) / size for i in range(num_batches)]
+    grand = sum(means) / num_batches
+    if grand == 0:
+        return float('inf')
+    variance = sum((x - grand) ** 2 for x in means) / (num_batches - 1)
+    t = t_quantile(0.5 + confidence / 2, num_batches - 1)
+    return t * (variance / num_batches) ** 0.5 / abs(grand)
+
+
+class AdaptiveController:
+    """
+    Decides when a streamed simulation has warmed up and sampled enough.
+
+    Warmup ends at the MSER-5 truncation point of the latency series; it is
+    only trusted once it falls in the first half of the data. Sampling stops
+    once the batch-means confidence intervals of both latency and throughput
+    on the truncated data are within the requested relative precision.
+    """
+
+    def __init__(self, nodes, period, precision=0.05, confidence=0.95, num_batches=10):
+        self.nodes = nodes
+        self.period = period
+        self.precision = precision
+        self.confidence = confidence
+        self.num_batches = num_batches
+        self.samples = []
+        self.periods = 0
+        self.truncation = 0
+
+    def add(self, sample):
+        # Empty periods carry no latency but still count towards the cycles
+        self.periods = sample.index + 1
+        if sample.packets:
+            self.samples.append(sample)
+
+    def done(self):
+        """Returns True once the estimate is stable"""
+        if len(self.samples) % MSER_BATCH:
+            return False
+        d, batches = mser5([s.latency for s in self.samples])
+        self.truncation = d * MSER_BATCH
+        if d == len(batches) // 2 or len(batches) - d < self.num_batches:
+            return False
+        tail = self.samples[self.truncation:]
+        latency_hw = relative_half_width([s.latency for s in tail], self.num_batches, self.confidence)
+        packets_hw = relative_half_width([s.packets for s in tail], self.num_batches, self.confidence)
+        return max(latency_hw, packets_hw) <= self.precision
+
+    def result(self):
+        """Packet-weighted latency and throughput over the post-warmup samples"""
+        if not self.samples:
+            return None
+        tail = self.samples[self.truncation:]
+        packets = sum(s.packets for s in tail)
+        first = tail[0].index
+        measured_cycles = (self.periods - first) * self.period
+        return {
+            'avg_latency': sum(s.latency * s.packets for s in tail) / packets,
+            'throughput': packets / (self.nodes * measured_cycles),
+            'warmup_cycles': first * self.period,
+            'measured_cycles': measured_cycles,
+            'samples': self.periods,
+        }
+
+
+def _launch(config_path, booksim, timeout):
+    """Starts booksim with a watchdog that kills it after timeout seconds"""
+    proc = subprocess.Popen([booksim, config_path], stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True, bufsize=1)
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    return proc, timer
+
+
+def _write_temp_config(config):
+    fd, path = tempfile.mkstemp(prefix='booksim_', suffix='.txt')
+    with os.fdopen(fd, 'w') as f:
+        f.write(config.to_text())
+    return path
+
+
+def run_fixed(config, booksim=BOOKSIM_EXE, timeout=300):
+    """Runs a config as-is and parses the overall statistics booksim prints at the end"""
+    path = _write_temp_config(config)
+    start = time.time()
+    proc, timer = _launch(path, booksim, timeout)
+    try:
+        output = proc.stdout.read()
+        proc.wait()
+    finally:
+        timer.cancel()
+        os.remove(path)
+
+    result = {'simulation_time': round(time.time() - start, 3), 'mode': 'fixed',
+              'sample_period': config.get('sample_period')}
+    if config.get('warmup_periods') > 0:
+        result['warmup_cycles'] = config.get('warmup_periods') * config.get('sample_period')
+    overall = output.split('Overall Traffic Statistics', 1)
+    if len(overall) == 2:
+        for key, pattern in (('avg_latency', r'Packet latency average = (\S+)'),
+                             ('avg_hops', r'Hops average = (\S+)'),
+                             ('throughput', r'Accepted packet rate average = (\S+)')):
+            match = re.search(pattern, overall[1])
+            result[key] = float(match.group(1)) if match else 'N/A'
+        result['status'] = 'ok'
+    elif proc.returncode == -signal.SIGKILL:
+        result['status'] = 'timeout'
+    elif 'Simulation unstable' in output:
+        result['status'] = 'unstable'
+    else:
+        result['status'] = 'crash'
+    return result
+
+
+def run_adaptive(config, booksim=BOOKSIM_EXE, timeout=300, period=100, max_cycles=100000,
+                 precision=0.05, confidence=0.95, num_batches=10):
+    """
+    Runs a config with warmup and sample lengths chosen from the streamed
+    statistics, stopping booksim as soon as the estimate is stable.
+    """
+    nodes = config.nodes()
+    if nodes is None:
+        raise ConfigError(f"Adaptive mode needs a statically known node count, "
+                          f"not available for topology {config.get('topology')}")
+
+    # Never leave warmup so booksim itself never converges or drains; the
+    # runner owns both decisions and terminates the process
+    max_periods = max(max_cycles // period, 2 * MSER_BATCH * num_batches)
+    adaptive = config.replace(sim_type='latency', sim_count=1, sample_period=period,
+                              max_samples=max_periods, warmup_periods=max_periods + 1)
+
+    controller = AdaptiveController(nodes, period, precision, confidence, num_batches)
+    events = []
+    status = 'max_cycles'
+    path = _write_temp_config(adaptive)
+    start = time.time()
+    proc, timer = _launch(path, booksim, timeout)
+    try:
+        for sample in iter_samples(proc.stdout, nodes, period, events):
+            controller.add(sample)
+            if controller.done():
+                status = 'ok'
+                break
+            if events:
+                break
+        if events:
+            status = events[0]
+        proc.terminate()
+        proc.stdout.close()
+        proc.wait()
+        if status == 'max_cycles':
+            if proc.returncode == -signal.SIGKILL:
+                status = 'timeout'
+            elif controller.periods < max_periods:
+                status = 'crash'
+    finally:
+        timer.cancel()
+        os.remove(path)
+
+    result = {'simulation_time': round(time.time() - start, 3), 'mode': 'adaptive',
+              'sample_period': period, 'status': status}
+    if status in ('ok', 'max_cycles') and controller.samples:
+        result.update(controller.result())
+    return result
+
+
+def result_row(config, result, source):
+    """Flattens a config and its result into a results CSV row"""
+    row = {field: 'N/A' for field in RESULT_FIELDS}
+    row.update({
+        'topology': config.get('topology'),
+        'k': config.get('k'),
+        'n': config.get('n'),
+        'nodes': config.nodes() if config.nodes() is not None else 'N/A',
+        'traffic_pattern': config.get('traffic'),
+        'injection_rate': config.get('injection_rate'),
+        'num_vcs': config.get('num_vcs'),
+        'config': source,
+        'finished_at': round(time.time(), 3),
+    })
+    row.update(result)
+    for key in ('avg_latency', 'throughput'):
+        if isinstance(row[key], float):
+            row[key] = round(row[key], 6)
+    return row
+
+
+def results_header(path):
+    """Returns the header of an existing results CSV, or None for a new file"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    with open(path, 'r', newline='') as f:
+        return next(csv.reader(f), None)
+
+
+def append_result(path, row):
+    """Appends a row to the results CSV, writing the header for a new file"""
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run booksim over a set of sweep configurations.')
+    parser.add_argument('configs', nargs='+', help='Config files to simulate')
+    parser.add_argument('--mode', choices=['fixed', 'adaptive'], default='adaptive',
+                        help='Use the config\'s warmup/sample lengths or choose them per point')
+    parser.add_argument('--booksim', default=BOOKSIM_EXE, help='Path to the booksim executable')
+    parser.add_argument('--results', default=RESULTS_CSV, help='CSV file results are appended to')
+    parser.add_argument('--timeout', type=float, default=300, help='Wall-clock limit per run (seconds)')
+    parser.add_argument('--period', type=int, default=100,
+                        help='Adaptive mode: cycles per streamed sample')
+    parser.add_argument('--max-cycles', type=int, default=100000,
+                        help='Adaptive mode: cap on simulated cycles per point')
+    parser.add_argument('--precision', type=float, default=0.05,
+                        help='Adaptive mode: target relative CI half-width')
+    args = parser.parse_args()
+
+    if not os.access(args.booksim, os.X_OK):
+        print(f"Error: booksim executable not found at {args.booksim}")
+        print("Build it with: make -C src")
+        sys.exit(1)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+    header = results_header(args.results)
+    if header is not None and header != RESULT_FIELDS:
+        print(f"Error: {args.results} was written with different columns")
+        print("Pass a new file with --results")
+        sys.exit(1)
+
+    sources = {}
+    configs = []
+    for path in args.configs:
+        try:
+            config = SimConfig.from_file(path)
+        except ConfigError as e:
+            print(f"{path}: {e}")
+            continue
+        sources.setdefault(config.key(), path)
+        configs.append(config)
+
+    # Every row carries the sweep it belongs to and how many points it will
+    # run, so a dashboard following a shared results file can tell sweeps apart
+    report = SweepReport()
+    points = list(prune(configs, report, verbose=True))
+    sweep = {'sweep_id': f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}", 'sweep_total': len(points)}
+
+    for config in points:
+        source = sources[config.key()]
+        print(f"Running {source} ... ", end='', flush=True)
+        try:
+            if args.mode == 'adaptive':
+                result = run_adaptive(config, args.booksim, args.timeout, args.period,
+                                      args.max_cycles, args.precision)
+            else:
+                result = run_fixed(config, args.booksim, args.timeout)
+        except ConfigError as e:
+            print(f"skipped: {e}")
+            result = {'status': 'skipped', 'mode': args.mode}
+        row = result_row(config, result, source)
+        row.update(sweep)
+        append_result(args.results, row)
+        if result['status'] == 'skipped':
+            continue
+        if 'avg_latency' in result:
+            print(f"{result['status']} (latency={result['avg_latency']:.2f}, "
+                  f"warmup={result.get('warmup_cycles', 'N/A')}, "
+                  f"measured={result.get('measured_cycles', 'N/A')})")
+        else:
+            print(result['status'])
+
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
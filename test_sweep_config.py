@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""
+Checks for config normalization, deduplication and static feasibility rules
+Run with: python -m pytest test_sweep_config.py
+"""
+
+import pytest
+
+from sweep_config import ConfigError, SimConfig, SweepReport, infeasibility, normalize_value, prune
+
+
+def categories(config):
+    return [category for category, _ in infeasibility(config)]
+
+
+def torus(**overrides):
+    params = dict(topology='torus', k=4, n=2, routing_function='dim_order',
+                  num_vcs=2, traffic='uniform', injection_rate=0.1)
+    params.update(overrides)
+    return SimConfig(params)
+
+
+def test_normalize_value_coerces_to_booksim_kinds():
+    assert normalize_value('k', '4') == 4
+    assert normalize_value('k', 4.0) == 4
+    assert isinstance(normalize_value('injection_rate', 1), float)
+    assert normalize_value('injection_rate', '0.25') == 0.25
+    assert normalize_value('topology', ' "mesh" ') == 'mesh'
+    assert normalize_value('use_read_write', '{1,0}') == '{1,0}'
+
+
+def test_normalize_value_rejects_bad_values():
+    with pytest.raises(ConfigError):
+        normalize_value('k', 4.5)
+    with pytest.raises(ConfigError):
+        normalize_value('k', 'four')
+    with pytest.raises(ConfigError):
+        normalize_value('no_such_field', 1)
+
+
+def test_key_ignores_spelling_and_restated_defaults():
+    explicit = torus(k='4', injection_rate='0.1', vc_buf_size=8)
+    implicit = torus(k=4.0, injection_rate=0.1)
+    assert explicit.key() == implicit.key()
+    assert explicit == implicit
+    report = SweepReport()
+    assert len(list(prune([explicit, implicit], report))) == 1
+    assert report.duplicates == 1
+
+
+def test_feasible_baseline():
+    assert infeasibility(torus()) == []
+
+
+def test_torus_credit_needs_dateline_vc():
+    assert 'deadlock' in categories(torus(topology='torus_credit', num_vcs=1))
+
+
+def test_transpose_needs_even_power_of_two():
+    assert 'traffic' in categories(torus(k=3, traffic='transpose'))
+    assert 'traffic' in categories(torus(k=2, n=3, traffic='transpose'))
+    assert categories(torus(k=4, n=2, traffic='transpose')) == []
+
+
+def test_min_vcs_per_routing_function():
+    assert 'vcs' in categories(torus(routing_function='valiant', num_vcs=2))
+    assert categories(torus(routing_function='valiant', num_vcs=4)) == []
+
+
+def test_min_vcs_halved_by_any_read_write_class():
+    assert 'vcs' in categories(torus(num_vcs=2, use_read_write=1))
+    assert 'vcs' in categories(torus(num_vcs=2, use_read_write='{0,1}'))
+    assert categories(torus(num_vcs=2, use_read_write='{0,0}')) == []
+    assert categories(torus(num_vcs=4, use_read_write='{0,1}')) == []
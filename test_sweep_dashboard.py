@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+"""
+Checks for the dashboard's results tailing and per-sweep aggregation
+Run with: python -m pytest test_sweep_dashboard.py
+"""
+
+from sweep_dashboard import ResultsTail, SweepSet
+
+HEADER = 'topology,k,n,traffic_pattern,injection_rate,num_vcs,avg_latency,throughput,status,sweep_id,sweep_total\n'
+
+
+def row(rate, sweep_id='a', total=2):
+    return f'torus,4,2,uniform,{rate},2,20.0,0.1,ok,{sweep_id},{total}\n'
+
+
+def as_dict(line):
+    return dict(zip(HEADER.strip().split(','), line.strip().split(',')))
+
+
+def test_tail_holds_back_partial_line(tmp_path):
+    path = tmp_path / 'results.csv'
+    line = row(0.1)
+    path.write_text(HEADER + line[:10])
+    tail = ResultsTail(str(path))
+    assert tail.poll() == []
+
+    with open(path, 'a') as f:
+        f.write(line[10:])
+    rows = tail.poll()
+    assert len(rows) == 1
+    assert rows[0]['injection_rate'] == '0.1'
+    assert tail.poll() == []
+
+
+def test_tail_starts_over_when_file_is_recreated(tmp_path):
+    path = tmp_path / 'results.csv'
+    path.write_text(HEADER + row(0.1) + row(0.2))
+    tail = ResultsTail(str(path))
+    assert len(tail.poll()) == 2
+
+    path.write_text(HEADER + row(0.3, sweep_id='b'))
+    rows = tail.poll()
+    assert [r['injection_rate'] for r in rows] == ['0.3']
+    assert rows[0]['sweep_id'] == 'b'
+
+
+def test_interleaved_sweeps_keep_separate_progress():
+    sweeps = SweepSet()
+    for line in (row(0.1, 'a'), row(0.1, 'b'), row(0.2, 'a')):
+        sweeps.add(as_dict(line), now=1.0)
+    assert sweeps.select('a').runs == 2
+    assert sweeps.select('b').runs == 1
+    assert sweeps.select().sweep_id == 'b'
+
+
+def test_backlog_rows_are_not_live():
+    sweeps = SweepSet()
+    sweeps.add(as_dict(row(0.1)))
+    assert sweeps.select().runs == 1
+    assert sweeps.select().live == 0
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""
+Checks for the adaptive runner's stream parsing and warmup detection
+Run with: python -m pytest test_sweep_runner.py
+"""
+
+from sweep_runner import (DEADLOCK_WARNINGS, AdaptiveController, Sample, iter_samples, mser5,
+                          t_quantile)
+
+NODES = 4
+PERIOD = 100
+
+
+def display_stats(period_stats, classes=1):
+    """
+    Builds the stdout booksim prints for a warm-up-only run, given the true
+    (latency, packets) of each period. Stats are cleared before even periods,
+    so odd periods report two-period averages, and 'latency change' follows
+    the block once per class.
+    """
+    lines = []
+    for index, (latency, packets) in enumerate(period_stats):
+        if index % 2 == 0:
+            window = [(latency, packets)]
+        else:
+            window = [period_stats[index - 1], (latency, packets)]
+        total = sum(p for _, p in window)
+        average = sum(l * p for l, p in window) / total if total else 0.0
+        rate = total / (NODES * PERIOD * len(window))
+        for c in range(classes):
+            lines += [f"Class {c}:",
+                      f"Packet latency average = {average}",
+                      "\tminimum = 1",
+                      f"Accepted packet rate average = {rate}"]
+        for c in range(classes):
+            lines += ["latency change    = 0.1", "throughput change = 0.1"]
+    return [line + '\n' for line in lines]
+
+
+def test_iter_samples_unwinds_two_period_averages():
+    stats = [(10.0, 40), (20.0, 60), (15.0, 50), (30.0, 30)]
+    samples = list(iter_samples(display_stats(stats), NODES, PERIOD))
+    assert [s.index for s in samples] == [0, 1, 2, 3]
+    assert [s.packets for s in samples] == [40, 60, 50, 30]
+    for sample, (latency, _) in zip(samples, stats):
+        assert abs(sample.latency - latency) < 1e-9
+
+
+def test_iter_samples_counts_periods_not_classes():
+    stats = [(10.0, 40), (20.0, 60), (15.0, 50)]
+    samples = list(iter_samples(display_stats(stats, classes=2), NODES, PERIOD))
+    assert [s.index for s in samples] == [0, 1, 2]
+    assert [s.packets for s in samples] == [40, 60, 50]
+
+
+def test_iter_samples_reports_saturation():
+    events = []
+    lines = display_stats([(10.0, 40)]) + ["Average latency for class 0 exceeded 500 cycles. "
+                                           "Aborting simulation.\n"]
+    list(iter_samples(lines, NODES, PERIOD, events))
+    assert events == ['saturated']
+
+
+def test_iter_samples_yields_empty_periods():
+    stats = [(10.0, 40), (20.0, 60), (0.0, 0), (0.0, 0)]
+    samples = list(iter_samples(display_stats(stats), NODES, PERIOD))
+    assert [s.index for s in samples] == [0, 1, 2, 3]
+    assert samples[2] == Sample(2, None, 0)
+    assert samples[3] == Sample(3, None, 0)
+
+
+def test_iter_samples_ignores_transient_deadlock_warning():
+    warning = ["WARNING: Possible network deadlock.\n"]
+    events = []
+    lines = (display_stats([(10.0, 40)]) + warning * (DEADLOCK_WARNINGS - 1)
+             + display_stats([(10.0, 40)]) + warning)
+    list(iter_samples(lines, NODES, PERIOD, events))
+    assert events == []
+
+    lines = display_stats([(10.0, 40)]) + warning * DEADLOCK_WARNINGS
+    list(iter_samples(lines, NODES, PERIOD, events))
+    assert events == ['deadlock']
+
+
+def test_mser5_truncates_transient():
+    observations = [100.0] * 10 + [10.0, 11.0, 9.0, 10.0, 10.0] * 8
+    d, batches = mser5(observations)
+    assert len(batches) == 10
+    assert d == 2
+
+
+def test_controller_records_warmup_and_measured_cycles():
+    controller = AdaptiveController(NODES, PERIOD)
+    for index in range(60):
+        latency = 100.0 if index < 10 else 10.0 + (index % 2)
+        controller.add(Sample(index, latency, 40))
+    assert controller.done()
+    result = controller.result()
+    assert result['warmup_cycles'] == 10 * PERIOD
+    assert result['measured_cycles'] == 50 * PERIOD
+    assert abs(result['avg_latency'] - 10.5) < 1e-9
+    assert abs(result['throughput'] - 40 / (NODES * PERIOD)) < 1e-9
+
+
+def test_t_quantile_matches_table():
+    assert abs(t_quantile(0.975, 9) - 2.262) < 0.002
+    assert abs(t_quantile(0.975, 29) - 2.045) < 0.002
+
+
+def test_controller_counts_trailing_empty_periods():
+    controller = AdaptiveController(NODES, PERIOD)
+    for index in range(4):
+        controller.add(Sample(index, 10.0, 40))
+    controller.add(Sample(4, None, 0))
+    controller.add(Sample(5, None, 0))
+    assert controller.periods == 6
+    result = controller.result()
+    assert result['samples'] == 6
+    assert result['measured_cycles'] == 6 * PERIOD
+    assert abs(result['throughput'] - 160 / (NODES * 6 * PERIOD)) < 1e-9